@@ -501,7 +501,9 @@ def main(experiment_name=None):
     # Filter by specific test case IDs if configured
     selected_test_cases = orchestrator.cfg.selected_test_cases
     if selected_test_cases:
-        dataset = [case for case in dataset if case.get('id') in selected_test_cases]
+        # Hash the selected IDs once so the filter is O(dataset) instead of O(dataset x selection)
+        selected_ids = frozenset(selected_test_cases)
+        dataset = [case for case in dataset if case.get('id') in selected_ids]
         if not dataset:
             logger.error(f"❌ No test cases found matching the selected IDs: {selected_test_cases}")
             return
@@ -16,11 +16,14 @@ class MemoryProcessor:
     def __init__(self, config: ExperimentConfig):
         self.config = config
         self.current_summary: str = ""
+        # (summarizer model, prompt file, history JSON) -> summary, kept for the current task
+        self._summary_cache: Dict[Tuple[str, str, str], str] = {}
         self._ace_state = ACEState()
 
     def reset_state(self):
         """Called by Orchestrator to reset memory between runs."""
         self.current_summary = ""
+        self._summary_cache.clear()
         self._ace_state.reset()
         logger.info("🧠 Memory State Reset")
 
@@ -109,6 +112,8 @@ class MemoryProcessor:
             llm_client=llm_client, 
             summarizer_model=settings.summarizer_model,
             summary_prompt_path=settings.summary_prompt,
+            # Off by default: reusing an earlier LLM summary changes what a retried turn measures
+            summary_cache=self._summary_cache if settings.cache_summaries else None,
             )
         return summarized_conv, get_token_count(summarized_conv)
     
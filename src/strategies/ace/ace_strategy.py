@@ -7,9 +7,7 @@ from typing import Dict, List, Tuple
 
 from src.strategies.ace.playbook_utils import (
     EMPTY_PLAYBOOK_TEMPLATE,
-    update_bullet_counts,
-    get_playbook_stats,
-    extract_playbook_bullets
+    ParsedPlaybook
 )
 from src.strategies.ace.generator import Generator
 from src.strategies.ace.reflector import Reflector
@@ -92,6 +90,9 @@ def apply_ace_strategy(
             last_user_msg = msg.get("content", "")
             break
     
+    # Parse the playbook once for extraction, tagging and stats in this step
+    parsed_playbook = ParsedPlaybook(state.playbook)
+    
     # Run Reflector if we have previous step data
     # Note: Only require reasoning trace - bullets may be empty on first steps (empty playbook bootstrap)
     has_reasoning = bool(state.last_reasoning_trace)
@@ -103,7 +104,7 @@ def apply_ace_strategy(
         reflector = Reflector()
         
         # Extract bullets used
-        bullets_used = extract_playbook_bullets(state.playbook, state.last_bullet_ids)
+        bullets_used = parsed_playbook.extract(state.last_bullet_ids)
         logger.debug(f"Bullets extracted for reflection: {bullets_used[:200] if bullets_used else '<empty>'}...")
         
         # Run reflection
@@ -123,7 +124,8 @@ def apply_ace_strategy(
         
         # Update bullet counts
         if bullet_tags:
-            state.playbook = update_bullet_counts(state.playbook, bullet_tags)
+            parsed_playbook.update_counts(bullet_tags)
+            state.playbook = parsed_playbook.render()
             logger.debug(f"Updated {len(bullet_tags)} bullet counts")
         else:
             logger.debug("⚠ No bullet_tags returned from Reflector - playbook counts NOT updated")
@@ -143,7 +145,7 @@ def apply_ace_strategy(
         curator = Curator()
         
         # Get playbook stats
-        stats = get_playbook_stats(state.playbook)
+        stats = parsed_playbook.stats()
         logger.debug(f"Playbook stats: {stats}")
         
         # Run curation
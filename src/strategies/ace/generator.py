@@ -7,10 +7,16 @@ import re
 from typing import List, Tuple
 
 from src.strategies.ace.playbook_utils import extract_json_from_text
+from src.utils.llm_response import get_response_content
 from src.utils.logger import get_logger
+from src.utils.prompt_loader import load_prompt
 
 logger = get_logger("ACE.Generator")
 
+# Fallback patterns for bullet IDs when the response is not JSON
+_BULLET_IDS_RE = re.compile(r'BULLET_IDS:\s*\[([^\]]+)\]')
+_NUMBER_LIST_RE = re.compile(r'\[(\d+(?:\s*,\s*\d+)*)\]')
+
 
 class Generator:
     """
@@ -31,8 +37,7 @@ class Generator:
                 "generator.prompt.md"
             )
         
-        with open(prompt_path, 'r') as f:
-            self.prompt_template = f.read()
+        self.prompt_template = load_prompt(prompt_path)
     
     def generate(
         self,
@@ -73,10 +78,7 @@ class Generator:
         response = llm_client.generate_plain(input_messages=messages, model=model)
         
         # Extract response text
-        if isinstance(response.choices[0].message, dict):
-            response_text = response.choices[0].message.get("content", "")
-        else:
-            response_text = getattr(response.choices[0].message, "content", "")
+        response_text = get_response_content(response)
         
         logger.debug(f"Generator LLM response (first 300 chars): {response_text[:300]}...")
         
@@ -106,15 +108,13 @@ class Generator:
                 return [int(i) for i in ids if isinstance(i, (int, str)) and str(i).isdigit()]
         
         # Fallback: regex for BULLET_IDS: [1, 2, 3]
-        pattern = r'BULLET_IDS:\s*\[([^\]]+)\]'
-        match = re.search(pattern, text)
+        match = _BULLET_IDS_RE.search(text)
         if match:
             ids_str = match.group(1)
             return [int(x.strip()) for x in ids_str.split(',') if x.strip().isdigit()]
         
         # Fallback: any list of numbers in brackets
-        pattern = r'\[(\d+(?:\s*,\s*\d+)*)\]'
-        matches = re.findall(pattern, text)
+        matches = _NUMBER_LIST_RE.findall(text)
         if matches:
             # Use the last match (most likely to be the bullet IDs)
             ids_str = matches[-1]
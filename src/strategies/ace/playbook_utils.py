@@ -4,7 +4,7 @@ Handles parsing, formatting, and manipulation of playbook bullets.
 """
 import re
 import json
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 
 # Empty playbook template with standard sections
@@ -29,6 +29,32 @@ EMPTY_PLAYBOOK_TEMPLATE = """# Agent Playbook
 <!-- Guidelines for clear and effective responses -->
 """
 
+# Matches a section header, capturing its title and optional slug, e.g. "## Task Decomposition (TSD)"
+_SECTION_HEADER_RE = re.compile(r'^\s*#+\s+(.*?)\s*(?:\(([A-Z]{3})\))?\s*$')
+
+# Matches a bullet line: [id] helpful=X harmful=Y :: content
+_BULLET_RE = re.compile(r'^\[(\d+)\]\s+helpful=(\d+)\s+harmful=(\d+)\s+::\s+(.+)$')
+
+# Matches a ```json fenced object in an LLM response
+_JSON_FENCE_RE = re.compile(r'```json\s*(\{.*?\})\s*```', re.DOTALL)
+
+# Structural tokens for the bare-object scan: a brace (with the string it opens, if
+# any), or a quote in a position where JSON allows a string to start
+_JSON_TOKEN_RE = re.compile(r'\{(\s*")?|\}|[\[,:]\s*"')
+
+# Rest of a JSON string literal up to and including its closing quote
+_JSON_STRING_TAIL_RE = re.compile(r'(?:[^"\\]++|\\.)*+"', re.DOTALL)
+
+# Section name -> slug; underscores in requested names are normalized to spaces before lookup
+_SLUG_MAP = {
+    "task decomposition": "TSD",
+    "error handling": "ERR",
+    "context management": "CTX",
+    "reasoning patterns": "RSN",
+    "tool usage": "TLS",
+    "communication": "COM",
+}
+
 
 def parse_playbook_line(line: str) -> Optional[Dict]:
     """
@@ -43,9 +69,12 @@ def parse_playbook_line(line: str) -> Optional[Dict]:
         Dict with keys: id, helpful, harmful, content
         None if line is not a valid bullet
     """
-    # Match pattern: [id] helpful=X harmful=Y :: content
-    pattern = r'^\[(\d+)\]\s+helpful=(\d+)\s+harmful=(\d+)\s+::\s+(.+)$'
-    match = re.match(pattern, line.strip())
+    # Cheap prefilter: headers, comments and blank lines never start with '['
+    stripped = line.strip()
+    if not stripped.startswith('['):
+        return None
+    
+    match = _BULLET_RE.match(stripped)
     
     if not match:
         return None
@@ -75,43 +104,237 @@ def format_playbook_line(bullet_id: int, helpful: int, harmful: int, content: st
     return f"[{bullet_id}] helpful={helpful} harmful={harmful} :: {content}"
 
 
-def update_bullet_counts(playbook_text: str, bullet_tags: List[Dict]) -> str:
+def _index_sections(lines: List[str]) -> Dict[str, int]:
     """
-    Update helpful/harmful counts for tagged bullets.
+    Map section headers to their line index.
+    
+    Each header is indexed by its 3-letter slug (e.g. "TSD") when present, by its
+    lowercased title and by its lowercased full header text (e.g. "task
+    decomposition (tsd)"), so ADD operations can resolve any of those forms.
     
     Args:
-        playbook_text: Current playbook content
-        bullet_tags: List of dicts with bullet_id and tag (helpful/harmful/neutral)
+        lines: Playbook lines
         
     Returns:
-        Updated playbook text
+        Dict of slug / lowercased title -> line index
     """
-    lines = playbook_text.split('\n')
-    updated_lines = []
+    section_index = {}
+    for i, line in enumerate(lines):
+        match = _SECTION_HEADER_RE.match(line)
+        if not match:
+            continue
+        title, slug = match.groups()
+        if slug:
+            section_index.setdefault(slug, i)
+        section_index.setdefault(title.lower(), i)
+        section_index.setdefault(line.strip().lstrip('#').strip().lower(), i)
+    return section_index
+
+
+class ParsedPlaybook:
+    """
+    Playbook parsed once into lines with their parsed bullets.
+    
+    Lets a caller tag, curate, extract and compute stats on a single parse
+    instead of re-splitting and re-parsing the text for every operation.
+    Untouched lines are kept verbatim, so render() round-trips exactly.
+    """
+    
+    def __init__(self, playbook_text: str):
+        """
+        Parse the playbook text.
+        
+        Args:
+            playbook_text: Playbook content
+        """
+        self.lines = playbook_text.split('\n')
+        # Parsed bullet dict per line, None for headers, comments and blank lines
+        self.bullets = [parse_playbook_line(line) for line in self.lines]
     
-    # Build lookup map for tags
-    tag_map = {tag["bullet_id"]: tag["tag"] for tag in bullet_tags}
+    def render(self) -> str:
+        """Return the playbook as text."""
+        return '\n'.join(self.lines)
     
-    for line in lines:
-        parsed = parse_playbook_line(line)
-        if parsed and parsed["id"] in tag_map:
-            tag = tag_map[parsed["id"]]
-            if tag == "helpful":
-                parsed["helpful"] += 1
-            elif tag == "harmful":
-                parsed["harmful"] += 1
-            # neutral: no change
+    def _reformat_line(self, idx: int):
+        """Re-format the line of a bullet that was modified in place."""
+        bullet = self.bullets[idx]
+        self.lines[idx] = format_playbook_line(
+            bullet["id"],
+            bullet["helpful"],
+            bullet["harmful"],
+            bullet["content"]
+        )
+    
+    def update_counts(self, bullet_tags: List[Dict]):
+        """
+        Update helpful/harmful counts for tagged bullets.
+        
+        Args:
+            bullet_tags: List of dicts with bullet_id and tag (helpful/harmful/neutral)
+        """
+        # Build lookup map for tags
+        tag_map = {tag["bullet_id"]: tag["tag"] for tag in bullet_tags}
+        
+        for i, bullet in enumerate(self.bullets):
+            if bullet and bullet["id"] in tag_map:
+                tag = tag_map[bullet["id"]]
+                if tag == "helpful":
+                    bullet["helpful"] += 1
+                    self._reformat_line(i)
+                elif tag == "harmful":
+                    bullet["harmful"] += 1
+                    self._reformat_line(i)
+                # neutral: no change
+    
+    def apply_operations(self, operations: List[Dict], next_id: int) -> int:
+        """
+        Apply curator operations (ADD / REMOVE / UPDATE).
+        
+        Args:
+            operations: List of operation dicts
+            next_id: Next available bullet ID
             
-            updated_lines.append(format_playbook_line(
-                parsed["id"],
-                parsed["helpful"],
-                parsed["harmful"],
-                parsed["content"]
-            ))
+        Returns:
+            Next available bullet ID after all ADDs
+        """
+        lines = self.lines
+        bullets = self.bullets
+        updated_id = next_id
+        # Index section headers once so each ADD is an O(1) lookup instead of a full scan
+        section_index = _index_sections(lines)
+        
+        for op in operations:
+            op_type = op.get("op", "").upper()
+            
+            if op_type == "ADD":
+                section = op.get("section", "")
+                content = op.get("content", "")
+                section_slug = get_section_slug(section)
+                
+                # Find the section and add bullet after section header
+                new_bullet = {"id": updated_id, "helpful": 0, "harmful": 0, "content": content}
+                new_line = format_playbook_line(updated_id, 0, 0, content)
+                # Resolve by mapped slug, then a bare slug given as the section (e.g. "TLS"),
+                # then the lowercased title or full header text
+                header_idx = section_index.get(section_slug)
+                section_key = section.lower()
+                if header_idx is None:
+                    header_idx = section_index.get(section.upper())
+                if header_idx is None:
+                    header_idx = section_index.get(section_key)
+                
+                if header_idx is not None:
+                    # Find insertion point (after header and comments), stripping each line once
+                    insert_idx = header_idx + 1
+                    num_lines = len(lines)
+                    while insert_idx < num_lines:
+                        stripped = lines[insert_idx].strip()
+                        if stripped and not stripped.startswith('<!--'):
+                            break
+                        insert_idx += 1
+                    lines.insert(insert_idx, new_line)
+                    bullets.insert(insert_idx, new_bullet)
+                    # Headers after the insertion point move down by one line
+                    for key, idx in section_index.items():
+                        if idx >= insert_idx:
+                            section_index[key] = idx + 1
+                else:
+                    # Append to end if section not found
+                    lines.append(f"\n## {section}")
+                    bullets.append(None)
+                    section_index[section_key] = len(lines) - 1
+                    lines.append(new_line)
+                    bullets.append(new_bullet)
+                
+                updated_id += 1
+                
+            elif op_type == "REMOVE":
+                bullet_id = op.get("bullet_id")
+                if bullet_id:
+                    keep = [i for i, b in enumerate(bullets) if not (b and b["id"] == bullet_id)]
+                    lines[:] = [lines[i] for i in keep]
+                    bullets[:] = [bullets[i] for i in keep]
+                    section_index = _index_sections(lines)
+            
+            elif op_type == "UPDATE":
+                bullet_id = op.get("bullet_id")
+                new_content = op.get("new_content", "")
+                if bullet_id and new_content:
+                    for i, bullet in enumerate(bullets):
+                        if bullet and bullet["id"] == bullet_id:
+                            bullet["content"] = new_content
+                            self._reformat_line(i)
+                            break
+        
+        return updated_id
+    
+    def stats(self) -> Dict:
+        """
+        Compute statistics about the playbook.
+        
+        Returns:
+            Dict with total_bullets, high_performing, problematic, unused
+        """
+        total = high_performing = problematic = unused = 0
+        # One pass with local counters instead of a filtered copy plus three generator scans
+        for bullet in self.bullets:
+            if not bullet:
+                continue
+            helpful = bullet["helpful"]
+            harmful = bullet["harmful"]
+            total += 1
+            if harmful == 0:
+                if helpful >= 3:
+                    high_performing += 1
+                elif helpful == 0:
+                    unused += 1
+            elif harmful >= 2:
+                problematic += 1
+        
+        return {
+            "total_bullets": total,
+            "high_performing": high_performing,
+            "problematic": problematic,
+            "unused": unused
+        }
+    
+    def extract(self, bullet_ids: List[int]) -> str:
+        """
+        Extract specific bullets by ID.
+        
+        Args:
+            bullet_ids: List of bullet IDs to extract
+            
+        Returns:
+            Formatted string of bullets
+        """
+        # Set membership keeps the scan O(lines) however many IDs the Generator cited
+        wanted_ids = set(bullet_ids)
+        found_bullets = [
+            line for line, bullet in zip(self.lines, self.bullets)
+            if bullet and bullet["id"] in wanted_ids
+        ]
+        
+        if found_bullets:
+            return '\n'.join(found_bullets)
         else:
-            updated_lines.append(line)
+            return f"Bullets {bullet_ids} not found in playbook"
+
+
+def update_bullet_counts(playbook_text: str, bullet_tags: List[Dict]) -> str:
+    """
+    Update helpful/harmful counts for tagged bullets.
     
-    return '\n'.join(updated_lines)
+    Args:
+        playbook_text: Current playbook content
+        bullet_tags: List of dicts with bullet_id and tag (helpful/harmful/neutral)
+        
+    Returns:
+        Updated playbook text
+    """
+    playbook = ParsedPlaybook(playbook_text)
+    playbook.update_counts(bullet_tags)
+    return playbook.render()
 
 
 def apply_curator_operations(
@@ -135,75 +358,13 @@ def apply_curator_operations(
     Returns:
         (updated_playbook, next_global_id)
     """
-    lines = playbook_text.split('\n')
-    updated_id = next_id
-    
-    for op in operations:
-        op_type = op.get("op", "").upper()
-        
-        if op_type == "ADD":
-            section = op.get("section", "")
-            content = op.get("content", "")
-            section_slug = get_section_slug(section)
-            
-            # Find the section and add bullet after section header
-            new_bullet = format_playbook_line(updated_id, 0, 0, content)
-            section_found = False
-            
-            # TODO: The ADD operation modifies the 'lines' list while iterating over it.
-            # When 'lines.insert(insert_idx, new_bullet)' is called inside the loop,
-            # it changes the list size and indices, but the loop continues with the
-            # original enumeration. This could lead to skipping sections or incorrect
-            # insertion points if multiple ADD operations target the same or subsequent
-            # sections. Consider processing ADD operations separately or collecting
-            # insertion points before modifying the list.
-            for i, line in enumerate(lines):
-                # Look for section header (e.g., "## Task Decomposition (TSD)")
-                if f"({section_slug})" in line or section.lower() in line.lower():
-                    section_found = True
-                    # Find insertion point (after header and comments)
-                    insert_idx = i + 1
-                    while insert_idx < len(lines) and (
-                        lines[insert_idx].strip().startswith('<!--') or
-                        lines[insert_idx].strip() == ''
-                    ):
-                        insert_idx += 1
-                    lines.insert(insert_idx, new_bullet)
-                    break
-            
-            if not section_found:
-                # Append to end if section not found
-                lines.append(f"\n## {section}")
-                lines.append(new_bullet)
-            
-            updated_id += 1
-            
-        elif op_type == "REMOVE":
-            bullet_id = op.get("bullet_id")
-            if bullet_id:
-                new_lines = []
-                for line in lines:
-                    parsed = parse_playbook_line(line)
-                    if not (parsed and parsed["id"] == bullet_id):
-                        new_lines.append(line)
-                lines = new_lines
-        
-        elif op_type == "UPDATE":
-            bullet_id = op.get("bullet_id")
-            new_content = op.get("new_content", "")
-            if bullet_id and new_content:
-                for i, line in enumerate(lines):
-                    parsed = parse_playbook_line(line)
-                    if parsed and parsed["id"] == bullet_id:
-                        lines[i] = format_playbook_line(
-                            parsed["id"],
-                            parsed["helpful"],
-                            parsed["harmful"],
-                            new_content
-                        )
-                        break
+    # Curator steps often return no operations; skip parsing and re-rendering entirely
+    if not operations:
+        return playbook_text, next_id
     
-    return '\n'.join(lines), updated_id
+    playbook = ParsedPlaybook(playbook_text)
+    updated_id = playbook.apply_operations(operations, next_id)
+    return playbook.render(), updated_id
 
 
 def get_playbook_stats(playbook_text: str) -> Dict:
@@ -213,24 +374,7 @@ def get_playbook_stats(playbook_text: str) -> Dict:
     Returns:
         Dict with total_bullets, high_performing, problematic, unused
     """
-    lines = playbook_text.split('\n')
-    bullets = []
-    for line in lines:
-        parsed = parse_playbook_line(line)
-        if parsed:
-            bullets.append(parsed)
-    
-    total = len(bullets)
-    high_performing = sum(1 for b in bullets if b["helpful"] >= 3 and b["harmful"] == 0)
-    problematic = sum(1 for b in bullets if b["harmful"] >= 2)
-    unused = sum(1 for b in bullets if b["helpful"] == 0 and b["harmful"] == 0)
-    
-    return {
-        "total_bullets": total,
-        "high_performing": high_performing,
-        "problematic": problematic,
-        "unused": unused
-    }
+    return ParsedPlaybook(playbook_text).stats()
 
 
 def extract_playbook_bullets(playbook_text: str, bullet_ids: List[int]) -> str:
@@ -244,18 +388,7 @@ def extract_playbook_bullets(playbook_text: str, bullet_ids: List[int]) -> str:
     Returns:
         Formatted string of bullets
     """
-    lines = playbook_text.split('\n')
-    found_bullets = []
-    
-    for line in lines:
-        parsed = parse_playbook_line(line)
-        if parsed and parsed["id"] in bullet_ids:
-            found_bullets.append(line)
-    
-    if found_bullets:
-        return '\n'.join(found_bullets)
-    else:
-        return f"Bullets {bullet_ids} not found in playbook"
+    return ParsedPlaybook(playbook_text).extract(bullet_ids)
 
 
 def extract_json_from_text(text: str) -> Optional[Dict]:
@@ -268,15 +401,17 @@ def extract_json_from_text(text: str) -> Optional[Dict]:
     Returns:
         Parsed JSON dict or None if parsing fails
     """
-    # Try parsing as-is first
-    try:
-        return json.loads(text.strip())
-    except json.JSONDecodeError:
-        pass
+    # Try parsing as-is first, but only when the text can be JSON; prose responses
+    # would otherwise pay for a full parse attempt and the raised exception
+    stripped = text.strip()
+    if stripped and stripped[0] in '{[':
+        try:
+            return json.loads(stripped)
+        except json.JSONDecodeError:
+            pass
     
     # Look for JSON code blocks
-    json_pattern = r'```json\s*(\{.*?\})\s*```'
-    match = re.search(json_pattern, text, re.DOTALL)
+    match = _JSON_FENCE_RE.search(text)
     if match:
         try:
             return json.loads(match.group(1))
@@ -284,17 +419,76 @@ def extract_json_from_text(text: str) -> Optional[Dict]:
             pass
     
     # Look for bare JSON objects
-    json_pattern = r'(\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\})'
-    matches = re.findall(json_pattern, text, re.DOTALL)
-    for match in matches:
+    for candidate in _iter_json_spans(text):
         try:
-            return json.loads(match)
+            obj = json.loads(candidate)
         except json.JSONDecodeError:
             continue
+        if isinstance(obj, dict):
+            return obj
     
     return None
 
 
+def _iter_json_spans(text: str) -> Iterator[str]:
+    """
+    Yield outermost balanced {...} spans from text in a single linear pass.
+    
+    Braces inside JSON string literals are ignored. A quote only opens a string
+    inside a span and where JSON allows one (after '{', '[', ',' or ':'), so stray
+    quotes in prose do not swallow the rest of the text. Spans closed inside a
+    brace that never closes are still yielded, after the top-level spans.
+    
+    Args:
+        text: Text potentially containing JSON objects
+        
+    Yields:
+        Candidate JSON object substrings, in text order, never overlapping
+    """
+    stack = []      # Positions of currently open braces
+    deferred = []   # (start, end, enclosing brace) for spans closed under an open brace
+    pos = 0
+    while True:
+        match = _JSON_TOKEN_RE.search(text, pos)
+        if not match:
+            break
+        token = match.group()
+        pos = match.end()
+        
+        if token == '}':
+            if not stack:
+                continue
+            start = stack.pop()
+            if stack:
+                deferred.append((start, pos, stack[-1]))
+            else:
+                # Everything deferred so far lies inside this span
+                deferred.clear()
+                yield text[start:pos]
+            continue
+        
+        if token[0] == '{':
+            stack.append(match.start())
+        elif not stack:
+            # Quotes outside any span are prose
+            continue
+        if token[-1] != '"':
+            continue
+        
+        # Skip the string literal; an unterminated one means the quote was stray,
+        # so scanning resumes right after it. Nothing after an unterminated quote
+        # can open a string again, so this never rescans more than once
+        string_end = _JSON_STRING_TAIL_RE.match(text, pos)
+        if string_end:
+            pos = string_end.end()
+    
+    # Braces still open never closed; spans directly inside them are outermost
+    unclosed = set(stack)
+    for start, end, enclosing in deferred:
+        if enclosing in unclosed:
+            yield text[start:end]
+
+
 def get_section_slug(section_name: str) -> str:
     """
     Map section name to 3-letter slug.
@@ -305,18 +499,4 @@ def get_section_slug(section_name: str) -> str:
     Returns:
         3-letter slug
     """
-    slug_map = {
-        "task_decomposition": "TSD",
-        "task decomposition": "TSD",
-        "error_handling": "ERR",
-        "error handling": "ERR",
-        "context_management": "CTX",
-        "context management": "CTX",
-        "reasoning_patterns": "RSN",
-        "reasoning patterns": "RSN",
-        "tool_usage": "TLS",
-        "tool usage": "TLS",
-        "communication": "COM",
-    }
-    
-    return slug_map.get(section_name.lower(), "GEN")
+    return _SLUG_MAP.get(section_name.lower().replace("_", " "), "GEN")
@@ -6,7 +6,9 @@ import os
 from typing import Dict, List, Tuple
 
 from src.strategies.ace.playbook_utils import extract_json_from_text
+from src.utils.llm_response import get_response_content
 from src.utils.logger import get_logger
+from src.utils.prompt_loader import load_prompt
 
 logger = get_logger("ACE.Reflector")
 
@@ -38,11 +40,8 @@ class Reflector:
                 "reflector_no_gt.prompt.md"
             )
         
-        with open(prompt_path_gt, 'r') as f:
-            self.prompt_template_gt = f.read()
-        
-        with open(prompt_path_no_gt, 'r') as f:
-            self.prompt_template_no_gt = f.read()
+        self.prompt_template_gt = load_prompt(prompt_path_gt)
+        self.prompt_template_no_gt = load_prompt(prompt_path_no_gt)
     
     def reflect(
         self,
@@ -101,10 +100,7 @@ class Reflector:
         response = llm_client.generate_plain(input_messages=messages, model=model)
         
         # Extract response text
-        if isinstance(response.choices[0].message, dict):
-            response_text = response.choices[0].message.get("content", "")
-        else:
-            response_text = getattr(response.choices[0].message, "content", "")
+        response_text = get_response_content(response)
         
         logger.debug(f"Reflector LLM response (first 300 chars): {response_text[:300]}...")
         
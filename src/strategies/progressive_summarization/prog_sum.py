@@ -1,22 +1,27 @@
-from typing import Dict, List, Optional
+import json
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+from src.utils.llm_response import get_response_content
 from src.utils.logger import get_logger
+from src.utils.prompt_loader import load_prompt
 from src.utils.split_trace import process_and_split_trace_user
 
 logger = get_logger("ProgressiveSummarization")
 
+# Resolved once at import; resolve() stats the filesystem on every call
+_REPO_ROOT = Path(__file__).resolve().parents[3]
+
 
 def _resolve_prompt_path(prompt_path: Optional[str]) -> Path:
-    repo_root = Path(__file__).resolve().parents[3]
     if prompt_path:
         candidate = Path(prompt_path)
         if candidate.is_file():
             return candidate
-        candidate_from_root = repo_root / prompt_path
+        candidate_from_root = _REPO_ROOT / prompt_path
         if candidate_from_root.is_file():
             return candidate_from_root
-    return repo_root / "src/strategies/progressive_summarization/prog_sum.prompt.md"
+    return _REPO_ROOT / "src/strategies/progressive_summarization/prog_sum.prompt.md"
 
 
 def summarize_conv_history(
@@ -24,6 +29,7 @@ def summarize_conv_history(
     llm_client,
     summarizer_model: str = "gpt-4-1-mini",
     summary_prompt_path: Optional[str] = None,
+    summary_cache: Optional[Dict[Tuple[str, str, str], str]] = None,
 ) -> List[Dict]:
     if llm_client is None:
         raise ValueError("llm_client is required for progressive summarization")
@@ -31,36 +37,39 @@ def summarize_conv_history(
     user_query, conversation_history = process_and_split_trace_user(messages)
 
     prompt_file = _resolve_prompt_path(summary_prompt_path)
-    summarization_prompt = prompt_file.read_text(encoding="utf-8")
-
-    # Build prompt for summarization
-    prompt_messages = [ 
-        {"role": "system", "content": summarization_prompt},
-        {"role": "user", "content": f"Conversation history to compress:\n{conversation_history}"},
-    ]
-
-    # Call LLM to generate summary (let exceptions propagate)
-    response = llm_client.generate_plain(
-        input_messages=prompt_messages, 
-        model=summarizer_model
-    )
-
-    # Extract summary text from response
-    message = response.choices[0].message
-    if isinstance(message, dict):
-        summary_text = (message.get("content") or "").strip()
-    else:
-        summary_text = (getattr(message, "content", "") or "").strip()
-
-    if not summary_text:
-        raise ValueError("Summarization returned empty content")
-
-    # Build final message list: [summary, user query]
+    summarization_prompt = load_prompt(str(prompt_file))
+
+    # Serialize as compact JSON instead of the list repr: cheaper to build and fewer input tokens
+    history_json = json.dumps(conversation_history, ensure_ascii=False, separators=(",", ":"), default=str)
+
+    # Identical history (e.g. a retried turn) reuses the earlier summary instead of
+    # paying for another LLM round-trip
+    cache_key = (summarizer_model, str(prompt_file), history_json)
+    summary_text = summary_cache.get(cache_key) if summary_cache is not None else None
+
+    if summary_text is None:
+        # Build prompt for summarization
+        prompt_messages = [ 
+            {"role": "system", "content": summarization_prompt},
+            {"role": "user", "content": f"Conversation history to compress:\n{history_json}"},
+        ]
+
+        # Call LLM to generate summary (let exceptions propagate)
+        response = llm_client.generate_plain(
+            input_messages=prompt_messages, 
+            model=summarizer_model
+        )
+
+        # Extract summary text from response
+        summary_text = get_response_content(response).strip()
+
+        if not summary_text:
+            raise ValueError("Summarization returned empty content")
+
+        if summary_cache is not None:
+            summary_cache[cache_key] = summary_text
+
+    # Build final message list: [user query, summary] in a single list display
     summary_message = {"role": "system", "content": summary_text}
     
-    result = []
-    if user_query:
-        result.extend(user_query)
-    result.extend([summary_message])
-    
-    return result
\ No newline at end of file
+    return [*user_query, summary_message]
\ No newline at end of file
@@ -1,3 +1,4 @@
+import logging
 from typing import List, Dict
 from src.utils.logger import get_logger
 from src.utils.split_trace import process_and_split_trace_user_tool
@@ -14,9 +15,11 @@ def truncate_messages(
     """
 
     user_query, conversation_history, tool_interaction = process_and_split_trace_user_tool(messages)
-    logger.debug(f"""🧠 Truncation Strategy: 
-                User Query Tokens: {get_token_count(user_query)},
-                Conversation History Tokens: {get_token_count(conversation_history)}, 
-                Tool Interaction Tokens: {get_token_count(tool_interaction)}"""
-                 )
+    # The f-string below tokenizes three slices, so only build it when DEBUG is actually on
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"""🧠 Truncation Strategy: 
+                    User Query Tokens: {get_token_count(user_query)},
+                    Conversation History Tokens: {get_token_count(conversation_history)}, 
+                    Tool Interaction Tokens: {get_token_count(tool_interaction)}"""
+                     )
     return user_query + tool_interaction
\ No newline at end of file
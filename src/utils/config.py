@@ -29,6 +29,8 @@ class MemoryDef(BaseModel):
     # Fields for Progressive Summarization
     summary_prompt: Optional[str] = None
     summarizer_model: Optional[str] = None
+    # Reuse the summary of an identical history (e.g. a retried turn) instead of re-calling the LLM
+    cache_summaries: bool = False
     
     # ACE strategy fields
     generator_model: Optional[str] = "gpt-4-1-mini"
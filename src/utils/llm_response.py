@@ -0,0 +1,22 @@
+"""
+Helpers for reading LLM chat completion responses.
+"""
+
+
+def get_response_content(response) -> str:
+    """
+    Return the text content of the first choice of a chat completion.
+    
+    Clients may return messages as dicts or as objects, so both are handled here
+    once instead of at every call site. Missing or None content becomes "".
+    
+    Args:
+        response: Chat completion response with a `choices` list
+    
+    Returns:
+        Message content text
+    """
+    message = response.choices[0].message
+    if isinstance(message, dict):
+        return message.get("content") or ""
+    return getattr(message, "content", None) or ""
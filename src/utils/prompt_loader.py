@@ -0,0 +1,28 @@
+"""
+Cached prompt template loading.
+
+Agents are re-instantiated on every step, so prompt files are read from disk
+once per path and served from memory afterwards.
+"""
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=32)
+def load_prompt(path: str) -> str:
+    """
+    Read a prompt template, caching the contents by path.
+    
+    Args:
+        path: Path to the prompt file
+    
+    Returns:
+        Prompt template text
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def clear_prompt_cache():
+    """Drop cached prompt templates, e.g. after editing a prompt file mid-run."""
+    load_prompt.cache_clear()
@@ -1,5 +1,14 @@
 # contains utilities to split llm traces
-from typing import List, Dict, Tuple
+from operator import methodcaller
+from typing import List, Dict, Optional, Tuple
+
+_get_role = methodcaller("get", "role")
+
+
+def _role_array(messages: List[Dict]) -> List[str]:
+    """Extract every message role once so callers can scan a flat list instead of dicts."""
+    # map + methodcaller runs the loop in C while keeping dict.get's tolerance for missing roles
+    return list(map(_get_role, messages))
 
 
 def get_user_message(messages: List[Dict]) -> Tuple[List[Dict], List[int]]:
@@ -14,60 +23,45 @@ def get_user_message(messages: List[Dict]) -> Tuple[List[Dict], List[int]]:
     if not messages:
         return [], []
     
-    user_messages = []
-    user_messages_idx = []
-    for i, msg in enumerate(messages):
-        if msg.get("role") == "user":
-            user_messages.append(msg)
-            user_messages_idx.append(i)
+    user_messages_idx = [i for i, msg in enumerate(messages) if msg.get("role") == "user"]
     
-    return user_messages, user_messages_idx 
+    return [messages[i] for i in user_messages_idx], user_messages_idx
 
 
-def get_last_tool_interaction(messages: List[Dict]) -> Tuple[List[Dict], int]:
+def get_last_tool_interaction(messages: List[Dict], roles: Optional[List[str]] = None) -> Tuple[List[Dict], int]:
     """Get the last valid tool interaction from a list of messages.
     
-    Iterates through messages to find tool interactions following the pattern:
+    Finds the last tool interaction following the pattern:
     Assistant (with tool_calls) -> One or more Tool messages.
     
     Args:
         messages: List of message dictionaries
+        roles: Optional precomputed roles from _role_array(messages)
         
     Returns:
         Tuple of (tool_episode, start_index) where:
         - tool_episode: List containing [assistant_msg, tool_msg1, ...], or empty list
         - start_index: Index where the tool episode starts, or len(messages) if not found
     """
+    n = len(messages)
     if not messages:
-        return [], len(messages)
+        return [], n
 
-    last_interaction = ([], len(messages))
-    i = 0
-    
-    while i < len(messages):
-        msg = messages[i]
-        
-        # Check for assistant message with tool_calls
-        if msg.get("role") == "assistant" and msg.get("tool_calls"):
-            current_interaction = [msg]
-            start_idx = i
+    # Extract roles once so the scan indexes a flat list instead of calling dict.get
+    if roles is None:
+        roles = _role_array(messages)
+    
+    # Walk backwards: the first assistant with tool_calls directly followed by a tool
+    # message is the last valid interaction, so earlier messages are never visited
+    for i in range(n - 2, -1, -1):
+        if roles[i] == "assistant" and roles[i + 1] == "tool" and messages[i].get("tool_calls"):
+            # Collect the contiguous tool responses after the assistant message
+            end = i + 2
+            while end < n and roles[end] == "tool":
+                end += 1
+            return messages[i:end], i
             
-            # Look ahead for tool messages
-            j = i + 1
-            while j < len(messages) and messages[j].get("role") == "tool":
-                current_interaction.append(messages[j])
-                j += 1
-            
-            # If we found at least one tool response, this is a valid interaction
-            if len(current_interaction) > 1:
-                last_interaction = (current_interaction, start_idx)
-            
-            # Advance main pointer
-            i = j
-        else:
-            i += 1
-            
-    return last_interaction
+    return [], n
 
 
 def process_and_split_trace_user(messages: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
@@ -88,14 +82,12 @@ def process_and_split_trace_user(messages: List[Dict]) -> Tuple[List[Dict], List
     if not messages:
         return [], []
     
-    user_messages, user_message_idx = get_user_message(messages)
-    
-    if not user_messages:
-        return [], messages
-
-    conv_after_user_message = messages[user_message_idx[-1] + 1 :]
+    # Walk backwards and stop at the last user message instead of collecting all of them
+    for i in range(len(messages) - 1, -1, -1):
+        if messages[i].get("role") == "user":
+            return [messages[i]], messages[i + 1 :]
     
-    return [user_messages[-1]], conv_after_user_message
+    return [], messages
 
 
 def process_and_split_trace_user_tool(messages: List[Dict]) -> Tuple[List[Dict], List[Dict], List[Dict]]:
@@ -119,18 +111,20 @@ def process_and_split_trace_user_tool(messages: List[Dict]) -> Tuple[List[Dict],
     if not messages:
         return [], [], []
     
-    # Get all user messages and use the first one
-    user_messages, user_messages_idx = get_user_message(messages)
+    # Extract roles once and share them between the user and tool-episode lookups
+    roles = _role_array(messages)
     
-    # Extract the last valid tool episode and its start index
-    last_tool_episode, tool_episode_start_idx = get_last_tool_interaction(messages)
+    # Extract the last valid tool episode and its start index (backward scan from the tail)
+    last_tool_episode, tool_episode_start_idx = get_last_tool_interaction(messages, roles)
     
-    if not user_messages:
+    # Only the first user message is needed; list.index stops at the first match
+    try:
+        first_user_idx = roles.index("user")
+    except ValueError:
         return [], messages[:tool_episode_start_idx], last_tool_episode
 
     # Intermediate messages are between first user and the tool episode start
-    intermediate_start = user_messages_idx[0] + 1
     intermediate_end = tool_episode_start_idx if last_tool_episode else len(messages)
-    intermediate_messages = messages[intermediate_start:intermediate_end]
+    intermediate_messages = messages[first_user_idx + 1:intermediate_end]
     
-    return [user_messages[0]], intermediate_messages, last_tool_episode
\ No newline at end of file
+    return [messages[first_user_idx]], intermediate_messages, last_tool_episode
\ No newline at end of file
@@ -1,9 +1,14 @@
+import json
 import tiktoken
+from functools import lru_cache
 from src.utils.logger import get_logger
 
 logger = get_logger("TokenCounter")
 
+@lru_cache(maxsize=8)
 def _get_encoder(model_name: str | None):
+    # Resolving an encoding is far costlier than counting a short text, and every
+    # call to get_token_count needs one, so each model name is resolved only once
     normalized = model_name or "gpt-4"
     try:
         return tiktoken.encoding_for_model(normalized)
@@ -12,6 +17,15 @@ def _get_encoder(model_name: str | None):
         return tiktoken.get_encoding("cl100k_base")
 
 
+@lru_cache(maxsize=8192)
+def _count_text_tokens(enc, text: str) -> int:
+    # Benchmark histories grow turn by turn, so the same message texts are counted
+    # on every request; caching by (encoder, text) tokenizes each text only once.
+    # encode_ordinary skips the special-token scan, which also keeps literal
+    # "<|endoftext|>" strings in tool outputs from raising
+    return len(enc.encode_ordinary(text))
+
+
 def _iter_message_text_parts(message: dict) -> list[str]:
     parts: list[str] = []
 
@@ -35,9 +49,22 @@ def _iter_message_text_parts(message: dict) -> list[str]:
 
     function_call = message.get("function_call")
     if function_call is not None:
-        # if found necessary
-        # TODO: Extract actual content from function_call instead of using str() to get accurate token counts
-        parts.append(str(function_call))
+        # ComplexFuncBench stores a list of {"name", "arguments"} dicts (OpenAI legacy
+        # uses a single dict); count name and arguments like the tool_calls path
+        calls = function_call if isinstance(function_call, list) else [function_call]
+        for fc in calls:
+            if not isinstance(fc, dict):
+                parts.append(str(fc))
+                continue
+            name = fc.get("name")
+            if isinstance(name, str) and name:
+                parts.append(name)
+            arguments = fc.get("arguments")
+            if isinstance(arguments, str):
+                if arguments:
+                    parts.append(arguments)
+            elif arguments:
+                parts.append(json.dumps(arguments, ensure_ascii=False, separators=(",", ":"), default=str))
 
     return parts
 
@@ -57,10 +84,10 @@ def get_token_count(count_obj, model_name: str | None = None) -> int:
             if not isinstance(m, dict):
                 continue
             for text in _iter_message_text_parts(m):
-                count += len(enc.encode(text))
+                count += _count_text_tokens(enc, text)
     # count tokens in a single message (dict)
     elif isinstance(count_obj, dict):
         for text in _iter_message_text_parts(count_obj):
-            count += len(enc.encode(text))
+            count += _count_text_tokens(enc, text)
 
     return count
\ No newline at end of file
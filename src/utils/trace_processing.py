@@ -13,41 +13,49 @@ def detect_tail_loop(messages: List[Dict], threshold: int = 4, max_pattern_len:
     for m in messages[-(max_pattern_len * threshold):]: # Only look at the relevant tail
         # Create a signature tuple: (Role, Content, Sorted Tool Calls)
         tool_sig = None
-        if "tool_calls" in m:
-            tool_sig = sorted(
-                [(tc["type"], tc["function"]["name"], tc["function"]["arguments"]) for tc in m["tool_calls"]]
-            )
-            tool_sig = tuple(tool_sig)
+        # Single lookup; litellm dumps plain assistant replies with tool_calls=None
+        tool_calls = m.get("tool_calls")
+        if tool_calls is not None:
+            # Sort the full (type, name, arguments) triples so parallel calls compare
+            # order-independently; sorted() consumes the generator without a temp list
+            tool_sig = tuple(sorted(
+                (tc["type"], tc["function"]["name"], tc["function"]["arguments"]) for tc in tool_calls
+            ))
 
         normalized.append((m.get("role"), m.get("content"), tool_sig))
 
     # Re-calculate length based on the slice we actually took
     n_slice = len(normalized)
 
-    # 2. Check for patterns of length L
-    # We iterate L from 1 (repeating single message) up to max_pattern_len
+    if threshold < 2:
+        # A single occurrence of the last message trivially "repeats" once
+        return max_pattern_len >= 1 and n_slice >= 1
+
+    # 2. Compute the KMP failure function of the reversed tail, so that prefix m of
+    # `tail` is the last m messages read backwards. The smallest period of that prefix
+    # is m - failure[m - 1]
+    tail = normalized[::-1]
+    failure = [0] * n_slice
+    k = 0
+    for i in range(1, n_slice):
+        while k and tail[i] != tail[k]:
+            k = failure[k - 1]
+        if tail[i] == tail[k]:
+            k += 1
+        failure[i] = k
+
+    # 3. Check for patterns of length L
+    # The last L * threshold messages are `threshold` copies of the last L messages
+    # exactly when L is a period of that prefix. With threshold >= 2, any period L is
+    # a multiple of the smallest period (Fine-Wilf), so one divisibility test per L
+    # replaces the block-by-block comparisons
     for L in range(1, max_pattern_len + 1):
         # We need at least L * threshold messages to verify this pattern
-        if n_slice < L * threshold:
+        m = L * threshold
+        if n_slice < m:
             break
-            
-        # The "candidate" pattern is the very last L messages
-        pattern = normalized[-L:]
-        
-        # Check if this pattern appears 'threshold' times backwards
-        is_loop = True
-
-        for k in range(1, threshold):
-            # Compare the block before the current one
-            # e.g., if L=2, threshold=3:
-            # Check [-2:] vs [-4:-2]
-            # Check [-2:] vs [-6:-4]
-            prev_block = normalized[-(k + 1) * L : -k * L]
-            if prev_block != pattern:
-                is_loop = False
-                break
-
-        if is_loop:
+
+        if L % (m - failure[m - 1]) == 0:
             return True
 
-    return False
\ No newline at end of file
+    return False
@@ -14,7 +14,8 @@ from src.strategies.ace.playbook_utils import (
     get_playbook_stats,
     extract_playbook_bullets,
     extract_json_from_text,
-    get_section_slug
+    get_section_slug,
+    ParsedPlaybook
 )
 from src.strategies.ace.generator import Generator
 from src.strategies.ace.reflector import Reflector
@@ -166,6 +167,57 @@ def test_apply_curator_operations_multiple_adds():
     assert next_id == 3
 
 
+def test_apply_curator_operations_adds_keep_sections_aligned():
+    """Verifies repeated ADDs land under the right headers, including a newly appended section."""
+    operations = [
+        {"op": "ADD", "section": "task_decomposition", "content": "First TSD"},
+        {"op": "ADD", "section": "task_decomposition", "content": "Second TSD"},
+        {"op": "ADD", "section": "communication", "content": "COM insight"},
+        {"op": "ADD", "section": "Custom Section", "content": "Custom one"},
+        {"op": "ADD", "section": "Custom Section", "content": "Custom two"},
+    ]
+
+    updated, next_id = apply_curator_operations(EMPTY_PLAYBOOK_TEMPLATE, operations, next_id=1)
+    lines = updated.split('\n')
+
+    tsd_idx = lines.index("## Task Decomposition (TSD)")
+    err_idx = lines.index("## Error Handling (ERR)")
+    com_idx = lines.index("## Communication (COM)")
+    custom_idx = lines.index("## Custom Section")
+    assert tsd_idx < lines.index("[2] helpful=0 harmful=0 :: Second TSD") < err_idx
+    assert tsd_idx < lines.index("[1] helpful=0 harmful=0 :: First TSD") < err_idx
+    assert com_idx < lines.index("[3] helpful=0 harmful=0 :: COM insight") < custom_idx
+    assert custom_idx < lines.index("[5] helpful=0 harmful=0 :: Custom two")
+    assert updated.count("## Custom Section") == 1
+    assert next_id == 6
+
+
+def test_apply_curator_operations_add_by_full_header_text():
+    """Verifies an ADD naming the literal header text inserts under the existing header."""
+    operations = [{"op": "ADD", "section": "Tool Usage (TLS)", "content": "Check tool schemas"}]
+
+    updated, _ = apply_curator_operations(EMPTY_PLAYBOOK_TEMPLATE, operations, next_id=1)
+    lines = updated.split('\n')
+
+    assert updated.count("## Tool Usage (TLS)") == 1
+    assert lines.index("## Tool Usage (TLS)") < lines.index("[1] helpful=0 harmful=0 :: Check tool schemas") < lines.index("## Communication (COM)")
+
+
+def test_apply_curator_operations_add_by_slug():
+    """Verifies an ADD naming a bare slug (any case) inserts under the matching header."""
+    operations = [
+        {"op": "ADD", "section": "TLS", "content": "Slug insight"},
+        {"op": "ADD", "section": "ctx", "content": "Lowercase slug insight"},
+    ]
+
+    updated, _ = apply_curator_operations(EMPTY_PLAYBOOK_TEMPLATE, operations, next_id=1)
+    lines = updated.split('\n')
+
+    assert "## TLS" not in updated and "## ctx" not in updated
+    assert lines.index("## Tool Usage (TLS)") < lines.index("[1] helpful=0 harmful=0 :: Slug insight") < lines.index("## Communication (COM)")
+    assert lines.index("## Context Management (CTX)") < lines.index("[2] helpful=0 harmful=0 :: Lowercase slug insight") < lines.index("## Reasoning Patterns (RSN)")
+
+
 def test_apply_curator_operations_increments_global_id():
     """Verifies next_global_id increments correctly after ADD operations."""
     playbook = EMPTY_PLAYBOOK_TEMPLATE
@@ -181,6 +233,16 @@ def test_apply_curator_operations_increments_global_id():
     assert next_id == 8  # Started at 5, added 3
 
 
+def test_apply_curator_operations_empty_returns_input():
+    """Verifies an empty operation list returns the playbook and ID unchanged."""
+    playbook = "## Tool Usage (TLS)\n  [1] helpful=0 harmful=0 :: Indented bullet"
+
+    updated, next_id = apply_curator_operations(playbook, [], next_id=4)
+
+    assert updated is playbook
+    assert next_id == 4
+
+
 def test_apply_curator_operations_remove():
     """Verifies REMOVE operation deletes bullet by ID."""
     playbook = """# Playbook
@@ -255,6 +317,30 @@ def test_extract_playbook_bullets_not_found():
     assert "not found" in result.lower()
 
 
+def test_parsed_playbook_render_roundtrip():
+    """Verifies an untouched ParsedPlaybook renders its input verbatim."""
+    assert ParsedPlaybook(EMPTY_PLAYBOOK_TEMPLATE).render() == EMPTY_PLAYBOOK_TEMPLATE
+
+
+def test_parsed_playbook_chains_operations_on_one_parse():
+    """Verifies chained ops and tags on one parse match the standalone helpers."""
+    operations = [
+        {"op": "ADD", "section": "tool_usage", "content": "Check schemas"},
+        {"op": "ADD", "section": "error_handling", "content": "Retry once"},
+    ]
+    tags = [{"bullet_id": 1, "tag": "helpful"}, {"bullet_id": 2, "tag": "harmful"}]
+
+    playbook = ParsedPlaybook(EMPTY_PLAYBOOK_TEMPLATE)
+    next_id = playbook.apply_operations(operations, next_id=1)
+    playbook.update_counts(tags)
+
+    assert next_id == 3
+    assert playbook.extract([1]) == "[1] helpful=1 harmful=0 :: Check schemas"
+    assert playbook.stats() == {"total_bullets": 2, "high_performing": 0, "problematic": 0, "unused": 0}
+    expected, _ = apply_curator_operations(EMPTY_PLAYBOOK_TEMPLATE, operations, next_id=1)
+    assert playbook.render() == update_bullet_counts(expected, tags)
+
+
 def test_extract_json_from_text_clean():
     """Verifies clean JSON string is parsed correctly."""
     text = '{"key": "value", "number": 42}'
@@ -286,6 +372,20 @@ More text after.
     assert result["operations"][0]["op"] == "ADD"
 
 
+def test_extract_json_from_text_nested_in_prose():
+    """Verifies bare JSON with deep nesting and braces inside strings is extracted from prose."""
+    text = 'Noise { not json } then {"a": {"b": {"c": "x}{y"}}, "d": [1]} trailing'
+    result = extract_json_from_text(text)
+
+    assert result == {"a": {"b": {"c": "x}{y"}}, "d": [1]}
+
+    # An unclosed brace or stray quote earlier in the prose must not hide a later object
+    assert extract_json_from_text('Set the {placeholder then output: {"bullet_ids": [1, 2]}') == {"bullet_ids": [1, 2]}
+    assert extract_json_from_text('Prose {with "unbalanced quote} then {"a": 1}') == {"a": 1}
+    # Many unclosed braces before the object stay a single linear scan
+    assert extract_json_from_text('{ ' * 20000 + '{"a": 1}') == {"a": 1}
+
+
 def test_extract_json_from_text_invalid():
     """Verifies invalid JSON returns None without raising."""
     text = "This is not JSON at all { broken }"
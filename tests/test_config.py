@@ -10,3 +10,8 @@ def test_memory_def_accepts_auto_compact_threshold():
 
     assert definition.auto_compact_threshold == 4000
     assert definition.summarizer_model == "gpt-5-mini"
+
+
+def test_memory_def_cache_summaries_defaults_off():
+    assert MemoryDef(type="progressive_summarization").cache_summaries is False
+    assert MemoryDef(type="progressive_summarization", cache_summaries=True).cache_summaries is True
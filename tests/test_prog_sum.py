@@ -0,0 +1,54 @@
+import json
+from types import SimpleNamespace
+
+from src.strategies.progressive_summarization.prog_sum import summarize_conv_history
+
+
+class _RecordingClient:
+    """Returns a fixed summary and records the prompt it was sent."""
+
+    def __init__(self, summary: str = "Summary of the conversation"):
+        self.summary = summary
+        self.calls = []
+
+    def generate_plain(self, input_messages, model):
+        self.calls.append(input_messages)
+        message = SimpleNamespace(content=self.summary)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def test_summarize_conv_history_sends_history_as_json():
+    """Verifies the history after the last user message is sent as compact JSON and the result is [user, summary]."""
+    client = _RecordingClient()
+    messages = [
+        {"role": "system", "content": "System prompt"},
+        {"role": "user", "content": "Book a car"},
+        {"role": "assistant", "content": "Searching…"},
+        {"role": "tool", "content": "{\"cars\": []}", "tool_call_id": "tc-1"},
+    ]
+
+    result = summarize_conv_history(messages, client)
+
+    prompt = client.calls[0][1]["content"]
+    header, history_json = prompt.split("\n", 1)
+    assert header == "Conversation history to compress:"
+    assert json.loads(history_json) == messages[2:]
+    assert result == [messages[1], {"role": "system", "content": "Summary of the conversation"}]
+
+
+def test_summarize_conv_history_reuses_cached_summary():
+    """Verifies identical history is summarized once when a cache is passed, and changed history is not."""
+    client = _RecordingClient()
+    cache = {}
+    messages = [
+        {"role": "user", "content": "Book a car"},
+        {"role": "assistant", "content": "Searching…"},
+    ]
+
+    first = summarize_conv_history(messages, client, summary_cache=cache)
+    second = summarize_conv_history(list(messages), client, summary_cache=cache)
+    summarize_conv_history(messages + [{"role": "assistant", "content": "Found one"}], client, summary_cache=cache)
+
+    assert first == second
+    assert len(client.calls) == 2
+    assert len(cache) == 2
@@ -0,0 +1,16 @@
+from src.utils.prompt_loader import clear_prompt_cache, load_prompt
+
+
+def test_load_prompt_reads_file_once(tmp_path):
+    """Verifies prompt contents are cached by path until the cache is cleared."""
+    prompt_file = tmp_path / "example.prompt.md"
+    prompt_file.write_text("Original {placeholder}", encoding="utf-8")
+
+    assert load_prompt(str(prompt_file)) == "Original {placeholder}"
+
+    # Later edits are not picked up because the first read is cached
+    prompt_file.write_text("Edited", encoding="utf-8")
+    assert load_prompt(str(prompt_file)) == "Original {placeholder}"
+
+    clear_prompt_cache()
+    assert load_prompt(str(prompt_file)) == "Edited"
@@ -0,0 +1,60 @@
+from src.utils import token_count
+from src.utils.token_count import get_token_count
+
+
+class _CountingEncoder:
+    """Whitespace tokenizer that records how often it is asked to encode."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode_ordinary(self, text):
+        self.calls += 1
+        return text.split()
+
+
+def test_get_token_count_tokenizes_repeated_text_once(monkeypatch):
+    """Verifies texts already counted are served from the cache as the history grows."""
+    encoder = _CountingEncoder()
+    monkeypatch.setattr(token_count, "_get_encoder", lambda model_name: encoder)
+    history = [
+        {"role": "user", "content": "hello world"},
+        {"role": "assistant", "content": "hello world"},
+    ]
+
+    assert get_token_count(history) == 4
+    assert get_token_count(history + [{"role": "user", "content": "next turn here"}]) == 7
+    assert encoder.calls == 2
+
+
+def test_get_encoder_resolves_each_model_once(monkeypatch):
+    """Verifies the encoder lookup is cached per model name."""
+    lookups = []
+    monkeypatch.setattr(
+        token_count.tiktoken, "encoding_for_model", lambda name: lookups.append(name) or _CountingEncoder()
+    )
+    token_count._get_encoder.cache_clear()
+    try:
+        first = token_count._get_encoder("gpt-4o")
+        assert token_count._get_encoder("gpt-4o") is first
+        assert lookups == ["gpt-4o"]
+    finally:
+        token_count._get_encoder.cache_clear()
+
+
+def test_get_token_count_function_call_counts_name_and_arguments(monkeypatch):
+    """Verifies benchmark function_call lists are counted by field, not by their repr."""
+    encoder = _CountingEncoder()
+    monkeypatch.setattr(token_count, "_get_encoder", lambda model_name: encoder)
+    message = {
+        "role": "assistant",
+        "function_call": [
+            {"name": "Search_Flights", "arguments": {"from": "BER", "to": "JFK"}},
+            {"name": "Get_Weather", "arguments": "{}"},
+        ],
+    }
+
+    parts = token_count._iter_message_text_parts(message)
+
+    assert parts == ["Search_Flights", '{"from":"BER","to":"JFK"}', "Get_Weather", "{}"]
+    assert get_token_count(message) == 4
@@ -0,0 +1,74 @@
+import random
+
+from src.utils.trace_processing import detect_tail_loop
+
+
+def _make_message(role: str, content: str) -> dict:
+    return {"role": role, "content": content}
+
+
+def _tool_call_message(name: str, arguments: str, call_id: str) -> dict:
+    return {
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [
+            {"id": call_id, "type": "function", "function": {"name": name, "arguments": arguments}}
+        ],
+    }
+
+
+def _brute_force_tail_loop(messages, threshold, max_pattern_len):
+    """Reference check comparing the trailing blocks of length L directly."""
+    tail = [(m["role"], m["content"]) for m in messages[-(max_pattern_len * threshold):]]
+    for L in range(1, max_pattern_len + 1):
+        if len(tail) < L * threshold:
+            break
+        pattern = tail[-L:]
+        if all(tail[-(k + 1) * L : -k * L] == pattern for k in range(1, threshold)):
+            return True
+    return False
+
+
+def test_detect_tail_loop_repeated_tool_episode() -> None:
+    """Test that a repeated call/result pair is detected despite changing tool_call ids."""
+    messages = [_make_message("user", "Find flights")]
+    for i in range(4):
+        messages.append(_tool_call_message("search", '{"q": "BER"}', f"tc-{i}"))
+        messages.append({"role": "tool", "content": "no results", "tool_call_id": f"tc-{i}"})
+
+    assert detect_tail_loop(messages, threshold=4, max_pattern_len=5)
+
+
+def test_detect_tail_loop_tolerates_null_tool_calls() -> None:
+    """Test that assistant replies dumped with tool_calls=None are treated as plain messages."""
+    messages = [{"role": "assistant", "content": "Still checking", "tool_calls": None}] * 4
+
+    assert detect_tail_loop(messages, threshold=4, max_pattern_len=5)
+
+
+def test_detect_tail_loop_too_few_repetitions() -> None:
+    """Test that a pattern repeated fewer than threshold times is not a loop."""
+    messages = [_make_message("user", "start")]
+    messages += [_make_message("assistant", "a"), _make_message("tool", "b")] * 3
+
+    assert not detect_tail_loop(messages, threshold=4, max_pattern_len=5)
+
+
+def test_detect_tail_loop_pattern_longer_than_max() -> None:
+    """Test that a period longer than max_pattern_len is ignored."""
+    pattern = [_make_message("assistant", str(i)) for i in range(3)]
+
+    assert detect_tail_loop(pattern * 4, threshold=4, max_pattern_len=3)
+    assert not detect_tail_loop(pattern * 4, threshold=4, max_pattern_len=2)
+
+
+def test_detect_tail_loop_matches_block_comparison() -> None:
+    """Test period detection against direct block comparison on random traces."""
+    rng = random.Random(0)
+    for _ in range(2000):
+        messages = [_make_message(rng.choice("ua"), rng.choice("xy")) for _ in range(rng.randint(0, 30))]
+        threshold = rng.randint(2, 5)
+        max_pattern_len = rng.randint(1, 6)
+
+        expected = len(messages) >= threshold and _brute_force_tail_loop(messages, threshold, max_pattern_len)
+        assert detect_tail_loop(messages, threshold, max_pattern_len) == expected
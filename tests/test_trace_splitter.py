@@ -7,12 +7,7 @@ from src.utils.split_trace import (
 
 
 def _make_message(role: str, content: str, **extras) -> dict:
-    message = {
-        "role": role,
-        "content": content,
-    }
-    message.update(extras)
-    return message
+    return {"role": role, "content": content, **extras}
 
 
 # Tests for get_user_message
@@ -150,6 +145,24 @@ def test_get_last_tool_interaction_tool_id_mismatch() -> None:
     assert interaction[0]["role"] == "assistant"
 
 
+def test_get_last_tool_interaction_picks_last_of_several() -> None:
+    """Test that the last episode is returned even when followed by other messages."""
+    messages = [
+        _make_message("user", "Get data"),
+        _make_message("assistant", "First", tool_calls=[{"id": "tc-1"}]),
+        _make_message("tool", "Result 1", tool_call_id="tc-1"),
+        _make_message("assistant", "Second", tool_calls=[{"id": "tc-2"}, {"id": "tc-3"}]),
+        _make_message("tool", "Result 2", tool_call_id="tc-2"),
+        _make_message("tool", "Result 3", tool_call_id="tc-3"),
+        _make_message("assistant", "Dangling", tool_calls=[{"id": "tc-4"}]),
+        _make_message("assistant", "Done"),
+    ]
+
+    interaction, idx = get_last_tool_interaction(messages)
+    assert idx == 3
+    assert interaction == messages[3:6]
+
+
 def test_get_last_tool_interaction_no_preceding_assistant() -> None:
     """Test when tool messages have no preceding assistant message."""
     messages = [